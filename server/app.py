@@ -1,11 +1,26 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 import PyPDF2
 import io
-from typing import Dict, Any
+import gzip
+import json
+import threading
+import uuid
+from typing import Dict, Any, Callable
+
+# Optional faster JSON encoder and brotli support
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Load environment variables
 load_dotenv(dotenv_path=Path(__file__).with_name(".env"), override=True)
@@ -25,6 +40,67 @@ if not os.getenv('GEMINI_API_KEY') or os.getenv('GEMINI_API_KEY') == 'your_api_k
 # In-memory storage for tasks
 _tasks = []
 
+# Bumped whenever _tasks changes; read endpoints derive their ETags from it
+_tasks_generation = 0
+_tasks_lock = threading.Lock()
+
+# Generations restart at 0 with the process, so ETags carry a per-boot id
+# to keep a client's old ETag from matching new data after a restart
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+# Payloads smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+# Last serialized body per read endpoint: key -> (generation, body, {encoding: bytes})
+_response_cache = {}
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def versioned_json(key: str, generation: int, build: Callable[[], Any]) -> Response:
+    """JSON response for read endpoints backed by a generation-counted store.
+
+    Answers 304 when the client's ETag matches the current generation, only
+    re-serializes when the generation changed, and gzip/brotli-compresses
+    large bodies for clients that accept it.
+    """
+    etag = f"{_BOOT_ID}-{key}-{generation}"
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        cached = _response_cache.get(key)
+        if cached is None or cached[0] != generation:
+            cached = (generation, _dumps(build()), {})
+            _response_cache[key] = cached
+        _, body, encoded = cached
+
+        encoding = None
+        if len(body) >= COMPRESS_MIN_BYTES:
+            if brotli is not None and request.accept_encodings.quality("br") > 0:
+                encoding = "br"
+            elif request.accept_encodings.quality("gzip") > 0:
+                encoding = "gzip"
+
+        if encoding:
+            if encoding not in encoded:
+                if encoding == "br":
+                    encoded[encoding] = brotli.compress(body, quality=5)
+                else:
+                    encoded[encoding] = gzip.compress(body, compresslevel=6)
+            body = encoded[encoding]
+
+        resp = Response(body, mimetype="application/json")
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+
+    resp.set_etag(etag, weak=True)
+    resp.headers["Vary"] = "Accept-Encoding"
+    # Always revalidate; unchanged data costs a 304
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -54,6 +130,7 @@ def chat_endpoint():
 @app.route('/ingest/campus-doc', methods=['POST'])
 def ingest_campus_doc():
     """Ingest campus document (PDF)"""
+    global _tasks_generation
     try:
         if 'file' not in request.files:
             return jsonify({"ok": False, "error": "No file provided"}), 400
@@ -79,7 +156,10 @@ def ingest_campus_doc():
         
         # Parse tasks
         tasks = parse_pdf(file_path)
-        _tasks.extend(tasks)
+        if tasks:
+            with _tasks_lock:
+                _tasks.extend(tasks)
+                _tasks_generation += 1
         
         # Clean up
         os.remove(file_path)
@@ -135,7 +215,13 @@ def finance_summary():
 @app.route('/tasks', methods=['GET'])
 def get_tasks():
     """Get recently parsed tasks"""
-    return jsonify({"ok": True, "tasks": _tasks})
+    # Read the generation and the matching task count together so the cached
+    # body always describes the ETag it is stored under; _tasks only grows, so
+    # slicing to the count later reproduces exactly that snapshot
+    with _tasks_lock:
+        generation = _tasks_generation
+        count = len(_tasks)
+    return versioned_json("tasks", generation, lambda: {"ok": True, "tasks": _tasks[:count]})
 
 if __name__ == '__main__':
     app.run(host='127.0.0.1', port=8000, debug=True)
@@ -0,0 +1,377 @@
+"""Load-testing harness for the PantherAI Flask backend.
+
+Drives /chat, /ingest/campus-doc and /tasks with a weighted request mix and
+reports throughput plus p50/p95/p99 latency per endpoint.
+
+Examples:
+    python loadtest.py                                  # in-process test client
+    python loadtest.py --serve --concurrency 64         # local threaded server
+    python loadtest.py --url http://127.0.0.1:8000      # already running server
+    python loadtest.py --mix chat=6,tasks=3,ingest=1 --model-latency 0.8
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MIX = "chat=6,tasks=3,ingest=1"
+
+CHAT_MESSAGES = [
+    "When is the midterm for COP 3530?",
+    "What is the late policy for homework?",
+    "How much is the final exam worth?",
+    "Where are office hours held?",
+    "Summarize the grading breakdown",
+]
+
+SYLLABUS_LINES = [
+    "COP 3530 Data Structures - Fall Syllabus",
+    "Assignment 1: Linked Lists, due September 12th, 10%",
+    "Quiz 1: Stacks and Queues, due September 26th, 5%",
+    "Midterm: Trees and Heaps, due October 17th, 25%",
+    "Project: Graph Search, due November 14th, 20%",
+    "Final: Cumulative, due December 9th, 40%",
+]
+
+
+class StubResponse:
+    """Minimal stand-in for a Gemini response"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Gemini model replacement that sleeps instead of calling the API"""
+
+    def __init__(self, latency: float, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, random.gauss(self.latency, self.jitter))
+        time.sleep(delay)
+        return StubResponse(f"(stub answer for a {len(prompt)} char prompt)")
+
+
+def build_pdf(lines: List[str]) -> bytes:
+    """Build a tiny single-page PDF whose text PyPDF2 can extract"""
+    content = "BT /F1 11 Tf 14 TL 50 750 Td\n"
+    content += "".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '\n"
+        for line in lines
+    )
+    content += "ET"
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n"
+
+    xref_start = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_start}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a mix like 'chat=6,tasks=3,ingest=1' into endpoint weights"""
+    mix = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mix must give a positive weight to at least one endpoint")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+# Each endpoint is (method, path, payload builder). Payload builders return
+# the keyword arguments for the transport: {"json": ...} or {"files": ...}.
+def _chat_payload(rng: random.Random, pdf: bytes) -> Dict[str, Any]:
+    return {"json": {"message": rng.choice(CHAT_MESSAGES)}}
+
+
+def _ingest_payload(rng: random.Random, pdf: bytes) -> Dict[str, Any]:
+    # Unique names so concurrent uploads don't collide in /tmp
+    return {"files": {"file": (f"loadtest-{uuid.uuid4().hex}.pdf", pdf)}}
+
+
+def _tasks_payload(rng: random.Random, pdf: bytes) -> Dict[str, Any]:
+    return {}
+
+
+ENDPOINTS: Dict[str, Tuple[str, str, Callable[[random.Random, bytes], Dict[str, Any]]]] = {
+    "chat": ("POST", "/chat", _chat_payload),
+    "ingest": ("POST", "/ingest/campus-doc", _ingest_payload),
+    "tasks": ("GET", "/tasks", _tasks_payload),
+}
+
+
+class FlaskTransport:
+    """Sends requests through Flask's test client (one client per thread)"""
+
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.local = threading.local()
+
+    def request(self, method: str, path: str, json: Any = None, files: Dict = None) -> Tuple[int, Any]:
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+
+        if files:
+            data = {field: (io.BytesIO(body), name) for field, (name, body) in files.items()}
+            resp = client.open(path, method=method, data=data, content_type="multipart/form-data")
+        else:
+            resp = client.open(path, method=method, json=json)
+        return resp.status_code, resp.get_json(silent=True)
+
+    def close(self) -> None:
+        pass
+
+
+class HttpTransport:
+    """Sends requests over HTTP using a shared httpx client"""
+
+    def __init__(self, base_url: str, concurrency: int, timeout: float):
+        import httpx
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self.client = httpx.Client(base_url=base_url, limits=limits, timeout=timeout)
+
+    def request(self, method: str, path: str, json: Any = None, files: Dict = None) -> Tuple[int, Any]:
+        resp = self.client.request(method, path, json=json, files=files)
+        try:
+            body = resp.json()
+        except ValueError:
+            body = None
+        return resp.status_code, body
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def install_stub_model(latency: float, jitter: float) -> None:
+    """Replace gemini_router's model so /chat never leaves the process"""
+    import tools.gemini_router as gemini_router
+    gemini_router._model = StubModel(latency, jitter)
+
+
+def start_local_server(flask_app, host: str, port: int):
+    """Start a threaded werkzeug server in a background thread"""
+    import logging
+    from werkzeug.serving import make_server
+
+    # Per-request access logs would dominate the output and skew timings
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server(host, port, flask_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def run_load(transport, mix: Dict[str, float], concurrency: int, duration: float,
+             warmup: float = 0.0, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Run the workload and collect per-endpoint latencies"""
+    pdf = build_pdf(SYLLABUS_LINES)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    lock = threading.Lock()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    exceptions: Dict[str, int] = defaultdict(int)
+
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(None if seed is None else seed + worker_id)
+        local_lat = defaultdict(list)
+        local_err = defaultdict(int)
+        local_exc = defaultdict(int)
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            name = rng.choices(names, weights)[0]
+            method, path, payload = ENDPOINTS[name]
+            kwargs = payload(rng, pdf)
+
+            t0 = time.perf_counter()
+            try:
+                status, body = transport.request(method, path, **kwargs)
+                failed = status >= 400 or not (isinstance(body, dict) and body.get("ok"))
+            except Exception as e:
+                # Counted rather than printed so a failing server doesn't flood the output
+                local_exc[f"{name}: {type(e).__name__}"] += 1
+                failed = True
+            t1 = time.perf_counter()
+
+            if t0 < measure_from:
+                continue
+            local_lat[name].append(t1 - t0)
+            if failed:
+                local_err[name] += 1
+
+        with lock:
+            for name, values in local_lat.items():
+                latencies[name].extend(values)
+            for name, count in local_err.items():
+                errors[name] += count
+            for kind, count in local_exc.items():
+                exceptions[kind] += count
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+
+    elapsed = max(time.perf_counter() - measure_from, 1e-9)
+    return summarize(latencies, errors, exceptions, elapsed)
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int],
+              exceptions: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    """Reduce raw latencies to throughput and percentile stats"""
+    def stats(values: List[float], error_count: int) -> Dict[str, Any]:
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": error_count,
+            "rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": (values[-1] * 1000) if values else 0.0,
+        }
+
+    endpoints = {name: stats(values, errors.get(name, 0)) for name, values in latencies.items()}
+    all_values = [v for values in latencies.values() for v in values]
+    return {
+        "elapsed_s": elapsed,
+        "endpoints": endpoints,
+        "total": stats(all_values, sum(errors.values())),
+        "exceptions": dict(exceptions),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a fixed-width table of the results"""
+    header = f"{'endpoint':<10}{'reqs':>8}{'errs':>7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(f"Measured for {report['elapsed_s']:.1f}s")
+    print(header)
+    print("-" * len(header))
+    rows = sorted(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<10}{s['requests']:>8}{s['errors']:>7}{s['rps']:>10.1f}"
+            f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}"
+        )
+    if report["exceptions"]:
+        print("\nTransport exceptions:")
+        for kind, count in sorted(report["exceptions"].items()):
+            print(f"  {kind}: {count}")
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test PantherAI endpoints")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of an already running server (stub model is not applied)")
+    target.add_argument("--serve", action="store_true", help="Start a local threaded server and drive it over HTTP")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --serve")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted endpoint mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=_positive_int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured duration in seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of traffic excluded from stats")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Stub Gemini latency in seconds")
+    parser.add_argument("--model-jitter", type=float, default=None,
+                        help="Stddev of stub latency in seconds (default: 20%% of --model-latency)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the request mix")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    if args.model_jitter is None:
+        args.model_jitter = 0.2 * args.model_latency
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # The app and gemini_router print diagnostics to stdout on import and on
+    # request errors; keep stdout for the report so --json stays parseable
+    with contextlib.redirect_stdout(sys.stderr):
+        report = _run(args, mix)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+def _run(args: argparse.Namespace, mix: Dict[str, float]) -> Dict[str, Any]:
+    server = None
+    if args.url:
+        transport = HttpTransport(args.url, args.concurrency, args.timeout)
+    else:
+        install_stub_model(args.model_latency, args.model_jitter)
+        from app import app as flask_app
+        if args.serve:
+            server = start_local_server(flask_app, "127.0.0.1", args.port)
+            transport = HttpTransport(f"http://127.0.0.1:{args.port}", args.concurrency, args.timeout)
+        else:
+            transport = FlaskTransport(flask_app)
+
+    try:
+        return run_load(transport, mix, args.concurrency, args.duration, args.warmup, args.seed)
+    finally:
+        transport.close()
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -20,9 +20,25 @@ class IngestResponse(BaseModel):
     text_len: Optional[int] = None
     error: Optional[str] = None
 
+class RecurringCharge(BaseModel):
+    merchant: str
+    description: str
+    cadence: str
+    active: bool
+    amount: float
+    monthly_cost: float
+    interval_days: float
+    occurrences: int
+    first_date: str
+    last_date: str
+    next_expected: str
+    user: Optional[str] = None
+
 class FinanceSummary(BaseModel):
     ok: bool
     totals: Dict[str, float]
     roundups: float
     runway_days: int
+    recurring: List[RecurringCharge] = []
+    recurring_monthly: float = 0.0
     error: Optional[str] = None
@@ -1,27 +1,239 @@
 # Simple in-memory storage for documents (no ChromaDB for now)
 from typing import List, Dict, Any
+from functools import lru_cache
+from array import array
 import re
+import threading
+import zlib
 
-# In-memory document storage
-_documents = []
+import numpy as np
+
+# Target passage size in characters; documents are split on line boundaries
+PASSAGE_CHARS = 1200
+
+# How many decompressed passages to keep around for prompt assembly
+HOT_PASSAGES = 256
+
+# Preset dictionary shared by every passage. Short passages compress poorly
+# on their own, so seeding zlib with boilerplate that shows up in most
+# syllabi lets even the first occurrence of these phrases become a back
+# reference. zlib favours later entries, so the most common text goes last.
+SYLLABUS_ZDICT = (
+    "Florida International University FIU Miami Modesto A. Maidique Campus "
+    "Biscayne Bay Campus Panthers Canvas https://canvas.fiu.edu "
+    "Americans with Disabilities Act Disability Resource Center accommodations "
+    "academic misconduct academic integrity plagiarism Student Conduct and Honor Code "
+    "Panther Alert emergency incomplete grade withdrawal drop date "
+    "textbook required optional recommended reading chapter lecture notes slides "
+    "prerequisites corequisites learning outcomes course objectives course description "
+    "office hours by appointment email Zoom room building "
+    "attendance participation late submission policy make-up exam no late work accepted "
+    "grading scale A A- B+ B B- C+ C D F 93 90 87 83 80 77 70 60 "
+    "grade breakdown percentage points weight total 100% "
+    "Monday Tuesday Wednesday Thursday Friday Saturday Sunday "
+    "January February March April May June July August September October November December "
+    "Jan Feb Mar Apr May Jun Jul Aug Sep Sept Oct Nov Dec "
+    "Fall Spring Summer semester week Week 1 Week 2 Week 3 Week 4 Week 5 Week 6 Week 7 Week 8 "
+    "Week 9 Week 10 Week 11 Week 12 Week 13 Week 14 Week 15 Week 16 "
+    "homework assignment project lab quiz midterm exam final exam presentation paper "
+    "due date deadline submitted via Canvas by 11:59 PM "
+    "Instructor Professor Teaching Assistant TA Course Syllabus "
+    "the course students will be able to "
+    "Assignment 1 Assignment 2 Assignment 3 Quiz 1 Quiz 2 Quiz 3 Midterm Exam Final Exam "
+    "due "
+).encode("utf-8")
+
+# In-memory passage storage as parallel columns (a dict per passage would
+# cost more than the compressed text): zlib blob and owning document
+_passage_blobs = []
+_passage_doc = array("I")
+
+# Source name per document; text lives only in the compressed passages
+_document_sources = []
+
+# Inverted index from word to the ids of the passages containing it. Words
+# are keyed by their 64-bit hash (the store never leaves the process), and
+# there is no Python object per word or posting:
+#   - new postings are appended as (hash, passage id) pairs to two arrays;
+#   - once there are FRESH_POSTINGS of them (or an eighth of the packed
+#     segment, so merges get rarer as the corpus grows) they are merged into
+#     a packed CSR segment: sorted unique hashes, their byte offsets, and
+#     every word's ascending passage ids as varint-encoded gaps (most gaps
+#     fit in one byte instead of four).
+FRESH_POSTINGS = 16384
+
+_fresh_hashes = array("Q")
+_fresh_ids = array("I")
+_packed_hashes = np.empty(0, dtype=np.uint64)
+_packed_starts = np.zeros(1, dtype=np.int64)
+_packed_bytes = np.empty(0, dtype=np.uint8)
+
+_index_lock = threading.Lock()
+
+_WORD_RE = re.compile(r"\w+")
+
+# Words too common to say anything about relevance; never indexed
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in is it "
+    "its me my no not of on or our so than that the their them then there these "
+    "they this to us was we were what when where which who why will with you your".split()
+)
+
+def _compress(text: str) -> bytes:
+    compressor = zlib.compressobj(level=9, zdict=SYLLABUS_ZDICT)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+def _decompress(blob: bytes) -> str:
+    decompressor = zlib.decompressobj(zdict=SYLLABUS_ZDICT)
+    return (decompressor.decompress(blob) + decompressor.flush()).decode("utf-8")
+
+def _split_passages(text: str) -> List[str]:
+    """Split text on line boundaries into chunks of about PASSAGE_CHARS.
+
+    The chunks concatenate back to the original text exactly.
+    """
+    passages = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > PASSAGE_CHARS:
+            if current:
+                passages.append(current)
+                current = ""
+            # Cut after the last whitespace so no word is split across passages
+            cut = max(line.rfind(" ", 0, PASSAGE_CHARS), line.rfind("\t", 0, PASSAGE_CHARS)) + 1
+            if cut <= 0:
+                cut = PASSAGE_CHARS
+            passages.append(line[:cut])
+            line = line[cut:]
+        if current and len(current) + len(line) > PASSAGE_CHARS:
+            passages.append(current)
+            current = ""
+        current += line
+    if current:
+        passages.append(current)
+    return passages
+
+def _terms(text: str) -> set:
+    return {word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS}
+
+def _word_hash(word: str) -> int:
+    return hash(word) & 0xFFFFFFFFFFFFFFFF
+
+def _varint_sizes(values: np.ndarray) -> np.ndarray:
+    """Encoded length in bytes of each unsigned 32-bit value"""
+    return 1 + sum((values >= (1 << shift)).astype(np.int64) for shift in (7, 14, 21, 28))
+
+def _varint_encode(values: np.ndarray) -> np.ndarray:
+    """LEB128-encode unsigned 32-bit values: 7 bits per byte, high bit = more"""
+    values = values.astype(np.uint64)
+    sizes = _varint_sizes(values)
+    owner = np.repeat(np.arange(len(values)), sizes)
+    position = np.arange(len(owner)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    encoded = ((values[owner] >> (7 * position).astype(np.uint64)) & 0x7F).astype(np.uint8)
+    encoded[position < sizes[owner] - 1] |= 0x80
+    return encoded
+
+def _varint_decode(encoded: np.ndarray) -> np.ndarray:
+    """Inverse of _varint_encode"""
+    last = encoded < 0x80
+    ends = np.flatnonzero(last)
+    owner = np.cumsum(last) - last
+    position = np.arange(len(encoded)) - np.concatenate(([0], ends[:-1] + 1))[owner]
+    # Every term is below 2**35, so the float64 weights sum exactly
+    terms = (encoded & 0x7F).astype(np.uint64) << (7 * position).astype(np.uint64)
+    return np.bincount(owner, weights=terms, minlength=len(ends)).astype(np.uint32)
+
+def _postings(i: int) -> np.ndarray:
+    """Passage ids of the i-th packed word"""
+    gaps = _varint_decode(_packed_bytes[_packed_starts[i]:_packed_starts[i + 1]])
+    return np.cumsum(gaps, dtype=np.uint32)
+
+def _unpack() -> tuple:
+    """Every packed posting as parallel (hash, passage id) arrays"""
+    gaps = _varint_decode(_packed_bytes)
+    # Number of ids per word = terminating bytes in its byte range
+    ends_before = np.concatenate(([0], np.cumsum(_packed_bytes < 0x80)))
+    lengths = np.diff(ends_before[_packed_starts])
+    # Running sum of gaps, restarted at the first id of each word
+    totals = np.cumsum(gaps, dtype=np.uint64)
+    firsts = np.cumsum(lengths) - lengths
+    ids = totals - np.repeat(totals[firsts] - gaps[firsts], lengths)
+    return np.repeat(_packed_hashes, lengths), ids.astype(np.uint32)
+
+def _merge_fresh() -> None:
+    """Fold the fresh postings into the packed segment"""
+    global _fresh_hashes, _fresh_ids, _packed_hashes, _packed_starts, _packed_bytes
+
+    packed_hashes, packed_ids = _unpack()
+    hashes = np.concatenate([packed_hashes, np.array(_fresh_hashes, dtype=np.uint64)])
+    ids = np.concatenate([packed_ids, np.array(_fresh_ids, dtype=np.uint32)])
+
+    # Stable sort keeps each word's passage ids in insertion (ascending) order
+    order = np.argsort(hashes, kind="stable")
+    hashes = hashes[order]
+    ids = ids[order]
+    _packed_hashes, firsts = np.unique(hashes, return_index=True)
+
+    # Store the gap to the word's previous id; its first id is kept as is
+    gaps = np.diff(ids, prepend=np.uint32(0))
+    gaps[firsts] = ids[firsts]
+    offsets = np.concatenate(([0], np.cumsum(_varint_sizes(gaps))))
+    _packed_starts = offsets[np.append(firsts, len(ids))].astype(np.int64)
+    _packed_bytes = _varint_encode(gaps)
+    _fresh_hashes = array("Q")
+    _fresh_ids = array("I")
+
+@lru_cache(maxsize=HOT_PASSAGES)
+def passage_text(passage_id: int) -> str:
+    """Decompressed text of one passage (hot passages are cached)"""
+    return _decompress(_passage_blobs[passage_id])
 
 def add_document(text: str, source: str) -> None:
     """Add a document to the in-memory storage"""
-    _documents.append({
-        "text": text,
-        "source": source
-    })
+    # Compress and tokenize outside the lock; only the index update is serialized
+    chunks = [(_compress(chunk), _terms(chunk)) for chunk in _split_passages(text)]
+
+    with _index_lock:
+        doc_id = len(_document_sources)
+        _document_sources.append(source)
+
+        for blob, terms in chunks:
+            passage_id = len(_passage_blobs)
+            _passage_doc.append(doc_id)
+            _passage_blobs.append(blob)
+            for word in terms:
+                _fresh_hashes.append(_word_hash(word))
+                _fresh_ids.append(passage_id)
+
+        if len(_fresh_ids) >= max(FRESH_POSTINGS, len(_packed_bytes) // 8):
+            _merge_fresh()
 
 def query(question: str, k: int = 4) -> Dict[str, Any]:
-    """Simple keyword-based search"""
-    question_lower = question.lower()
-    results = []
-    
-    for doc in _documents:
-        text_lower = doc["text"].lower()
-        # Simple keyword matching
-        if any(word in text_lower for word in question_lower.split()):
-            results.append(doc)
-    
-    # Return top k results
-    return {"items": results[:k]}
+    """Simple keyword-based search over passages"""
+    words = _terms(question)
+
+    # Gather the passage ids of every query word from both index tiers
+    matches = []
+    with _index_lock:
+        fresh_hashes = np.array(_fresh_hashes, dtype=np.uint64)
+        fresh_ids = np.array(_fresh_ids, dtype=np.uint32)
+        for word in words:
+            h = np.uint64(_word_hash(word))
+            i = np.searchsorted(_packed_hashes, h)
+            if i < len(_packed_hashes) and _packed_hashes[i] == h:
+                matches.append(_postings(i))
+            matches.append(fresh_ids[fresh_hashes == h])
+
+    # Score = number of matched query words; earlier passages break ties
+    if not matches:
+        return {"items": []}
+    ids, counts = np.unique(np.concatenate(matches), return_counts=True)
+    top = ids[np.lexsort((ids, -counts))[:k]].tolist()
+
+    # Only the passages that make it into the prompt are decompressed
+    results = [
+        {"text": passage_text(pid), "source": _document_sources[_passage_doc[pid]]}
+        for pid in top
+    ]
+
+    return {"items": results}
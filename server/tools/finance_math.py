@@ -9,10 +9,62 @@ import io
 # In-memory storage for finance data
 _finance_df = None
 
+# (date, description, amount) column names of _finance_df, detected once at
+# ingest so every reader of the store uses the same columns
+_finance_columns = (None, None, None)
+
+# Bumped on every successful ingest so derived results can be cached
+_finance_generation = 0
+
+# (generation, result) of the last recurring-charge detection
+_recurring_cache = None
+
+# Expected spacing in days and allowed slack for each billing cadence
+CADENCES = [
+    ("weekly", 7, 2),
+    ("biweekly", 14, 3),
+    ("monthly", 30.44, 5),
+    ("quarterly", 91.3, 10),
+    ("yearly", 365.25, 20),
+]
+
+# Column names that identify whose transaction a row is. Matched exactly, since
+# looser matches catch per-row columns like "account balance"
+USER_COLUMNS = ['user', 'user_id', 'userid', 'username', 'account', 'account_id',
+                'account_number', 'customer_id', 'student_id']
+
+def _store(df: pd.DataFrame, columns: tuple) -> None:
+    """Replace the finance store and start a new generation"""
+    global _finance_df, _finance_columns, _finance_generation
+    _finance_df = df
+    _finance_columns = columns
+    _finance_generation += 1
+
+def _detect_columns(df: pd.DataFrame) -> tuple:
+    """Identify the (date, description, amount) columns of a transactions frame"""
+    date_col = None
+    desc_col = None
+    amount_col = None
+    
+    for col in df.columns:
+        if 'date' in col or 'time' in col:
+            date_col = col
+        elif 'desc' in col or 'memo' in col or 'note' in col:
+            desc_col = col
+        elif 'amount' in col or 'value' in col or 'total' in col:
+            amount_col = col
+    
+    # If we can't identify columns, use first three
+    if not all([date_col, desc_col, amount_col]):
+        cols = df.columns.tolist()
+        date_col = cols[0] if len(cols) > 0 else None
+        desc_col = cols[1] if len(cols) > 1 else None
+        amount_col = cols[2] if len(cols) > 2 else None
+    
+    return date_col, desc_col, amount_col
+
 def ingest_csv(csv_bytes: bytes) -> Dict[str, Any]:
     """Ingest CSV file and normalize data"""
-    global _finance_df
-    
     try:
         # Read CSV
         df = pd.read_csv(io.BytesIO(csv_bytes))
@@ -21,24 +73,7 @@ def ingest_csv(csv_bytes: bytes) -> Dict[str, Any]:
         df.columns = df.columns.str.lower().str.strip()
         
         # Try to identify columns
-        date_col = None
-        desc_col = None
-        amount_col = None
-        
-        for col in df.columns:
-            if 'date' in col or 'time' in col:
-                date_col = col
-            elif 'desc' in col or 'memo' in col or 'note' in col:
-                desc_col = col
-            elif 'amount' in col or 'value' in col or 'total' in col:
-                amount_col = col
-        
-        # If we can't identify columns, use first three
-        if not all([date_col, desc_col, amount_col]):
-            cols = df.columns.tolist()
-            date_col = cols[0] if len(cols) > 0 else None
-            desc_col = cols[1] if len(cols) > 1 else None
-            amount_col = cols[2] if len(cols) > 2 else None
+        date_col, desc_col, amount_col = _detect_columns(df)
         
         # Normalize data
         if date_col:
@@ -48,7 +83,7 @@ def ingest_csv(csv_bytes: bytes) -> Dict[str, Any]:
             df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
         
         # Store normalized dataframe
-        _finance_df = df
+        _store(df, (date_col, desc_col, amount_col))
         
         return {
             "ok": True,
@@ -75,25 +110,8 @@ def metrics() -> Dict[str, Any]:
     try:
         df = _finance_df.copy()
         
-        # Get amount column
-        amount_col = None
-        for col in df.columns:
-            if 'amount' in col or 'value' in col or 'total' in col:
-                amount_col = col
-                break
-        
-        if not amount_col:
-            amount_col = df.columns[2] if len(df.columns) > 2 else df.columns[0]
-        
-        # Calculate totals by category (using description)
-        desc_col = None
-        for col in df.columns:
-            if 'desc' in col or 'memo' in col or 'note' in col:
-                desc_col = col
-                break
-        
-        if not desc_col:
-            desc_col = df.columns[1] if len(df.columns) > 1 else df.columns[0]
+        # Columns identified at ingest (shared with recurring-charge detection)
+        _, desc_col, amount_col = _finance_columns
         
         # Group by description and sum amounts
         totals = df.groupby(desc_col)[amount_col].sum().to_dict()
@@ -109,11 +127,15 @@ def metrics() -> Dict[str, Any]:
         current_balance = credits + debits
         runway_days = (current_balance / monthly_expenses * 30) if monthly_expenses > 0 else 0
         
+        recurring = recurring_charges()
+        
         return {
             "ok": True,
             "totals": totals,
             "roundups": roundups,
-            "runway_days": int(runway_days)
+            "runway_days": int(runway_days),
+            "recurring": recurring.get("items", []),
+            "recurring_monthly": recurring.get("monthly_total", 0.0)
         }
         
     except Exception as e:
@@ -122,10 +144,185 @@ def metrics() -> Dict[str, Any]:
             "error": str(e)
         }
 
+def recurring_charges() -> Dict[str, Any]:
+    """Recurring charges for the current store, cached per ingest generation"""
+    global _recurring_cache
+    
+    if _finance_df is None:
+        return {
+            "ok": False,
+            "error": "No finance data available"
+        }
+    
+    if _recurring_cache is not None and _recurring_cache[0] == _finance_generation:
+        return _recurring_cache[1]
+    
+    generation_seen = _finance_generation
+    try:
+        items = detect_recurring(_finance_df, _finance_columns)
+        result = {
+            "ok": True,
+            "items": items,
+            # Ended subscriptions are listed but don't count toward the total
+            "monthly_total": round(sum(item["monthly_cost"] for item in items if item["active"]), 2)
+        }
+    except Exception as e:
+        return {
+            "ok": False,
+            "error": str(e)
+        }
+    
+    _recurring_cache = (generation_seen, result)
+    return result
+
+def normalize_merchant(descriptions: pd.Series) -> pd.Series:
+    """Reduce raw descriptions to a merchant key ('NETFLIX.COM #4411' -> 'netflix com')"""
+    return (
+        descriptions.astype(str)
+        .str.lower()
+        .str.replace(r'\S*\d\S*', ' ', regex=True)   # order ids, store numbers, dates
+        .str.replace(r'[^a-z&]+', ' ', regex=True)
+        .str.strip()
+    )
+
+def detect_recurring(df: pd.DataFrame, columns: tuple = None, min_occurrences: int = 3,
+                     amount_tolerance: float = 0.15, repeat_tolerance: float = 0.02,
+                     regularity: float = 0.75) -> List[Dict[str, Any]]:
+    """Find recurring charges: same merchant, similar amount, regular interval
+    
+    Charges are grouped by user, normalized merchant and amount cluster.
+    Everything runs as sorts plus groupby aggregations over integer keys, so
+    the cost is O(n log n) in the number of transactions with no per-row
+    Python work.
+    """
+    date_col, desc_col, amount_col = columns or _detect_columns(df)
+    user_col = next((col for col in df.columns
+                     if str(col).strip().lower().replace(' ', '_') in USER_COLUMNS), None)
+    if user_col in (date_col, desc_col, amount_col):
+        user_col = None
+    
+    dates = pd.to_datetime(df[date_col], errors='coerce')
+    amounts = pd.to_numeric(df[amount_col], errors='coerce')
+    
+    # Only debits can be subscriptions
+    mask = ((amounts < 0) & dates.notna()).to_numpy()
+    if not mask.any():
+        return []
+    
+    # Normalize each distinct description once, then map back as integer codes
+    desc_codes, desc_uniques = pd.factorize(df[desc_col].astype(str).to_numpy()[mask])
+    merchant_of_desc, merchants = pd.factorize(normalize_merchant(pd.Series(desc_uniques)))
+    merchant_codes = merchant_of_desc[desc_codes]
+    
+    if user_col:
+        all_user_codes, users = pd.factorize(df[user_col].astype(str).to_numpy())
+    else:
+        all_user_codes, users = np.zeros(len(df), dtype=np.int64), np.array([None])
+    user_codes = all_user_codes[mask]
+    
+    # Latest transaction of any kind per user (or for the whole store); a
+    # subscription whose next charge is overdue relative to it has ended
+    valid_dates = dates.notna().to_numpy()
+    user_last_seen = (
+        pd.Series(dates.to_numpy()[valid_dates])
+        .groupby(all_user_codes[valid_dates]).max()
+        .reindex(range(len(users))).to_numpy()
+    )
+    
+    charges = pd.DataFrame({
+        "key": user_codes.astype(np.int64) * len(merchants) + merchant_codes,
+        "date": dates.to_numpy()[mask],
+        "cost": -amounts.to_numpy()[mask],
+        "desc": desc_codes,
+    })
+    
+    # Descriptions that normalize to nothing (pure ids or digits) are skipped
+    charges = charges[merchants[merchant_codes] != ""]
+    if charges.empty:
+        return []
+    
+    # Split each merchant into amount clusters so two subscriptions behind one
+    # descriptor (or a subscription among ordinary purchases) are tested
+    # separately: sorted by cost, a new cluster starts wherever the cost jumps
+    # by more than the tolerance
+    charges = charges.sort_values(["key", "cost"], kind="mergesort")
+    key = charges["key"].to_numpy()
+    cost = charges["cost"].to_numpy()
+    new_cluster = np.ones(len(charges), dtype=bool)
+    new_cluster[1:] = (key[1:] != key[:-1]) | (cost[1:] > cost[:-1] * (1 + amount_tolerance))
+    charges["cluster"] = np.cumsum(new_cluster)
+    
+    charges = charges.sort_values(["cluster", "date"], kind="mergesort")
+    grouped = charges.groupby("cluster", sort=False)
+    charges["gap"] = grouped["date"].diff().dt.total_seconds() / 86400.0
+    prev_cost = grouped["cost"].shift()
+    median_gap = grouped["gap"].transform("median")
+    
+    # Per-row checks, averaged per group below. Subscriptions bill the same
+    # amount each time (a price change breaks only one step), unlike ordinary
+    # purchases that merely fall into the same amount cluster
+    charges["cost_ok"] = ((charges["cost"] - prev_cost).abs() <= repeat_tolerance * prev_cost).astype(float).where(prev_cost.notna())
+    gap_slack = np.maximum(2.0, 0.15 * median_gap)
+    charges["gap_ok"] = ((charges["gap"] - median_gap).abs() <= gap_slack).astype(float).where(charges["gap"].notna())
+    
+    summary = charges.groupby("cluster", sort=False).agg(
+        key=("key", "first"),
+        desc=("desc", "last"),
+        occurrences=("date", "size"),
+        first_date=("date", "first"),
+        last_date=("date", "last"),
+        last_amount=("cost", "last"),
+        interval_days=("gap", "median"),
+        cost_share=("cost_ok", "mean"),
+        gap_share=("gap_ok", "mean"),
+    )
+    
+    summary = summary[
+        (summary["occurrences"] >= min_occurrences)
+        & (summary["cost_share"] >= regularity)
+        & (summary["gap_share"] >= regularity)
+    ]
+    if summary.empty:
+        return []
+    
+    # Map the median interval onto a named billing cadence
+    interval = summary["interval_days"].to_numpy()
+    conditions = [np.abs(interval - days) <= slack for _, days, slack in CADENCES]
+    cadence_index = np.select(conditions, np.arange(len(CADENCES)), default=-1)
+    summary = summary[cadence_index >= 0]
+    cadence_index = cadence_index[cadence_index >= 0]
+    if summary.empty:
+        return []
+    
+    cadence_names = np.array([name for name, _, _ in CADENCES])
+    cadence_days = np.array([days for _, days, _ in CADENCES])
+    cadence_slack = np.array([slack for _, _, slack in CADENCES])
+    keys = summary["key"].to_numpy()
+    
+    due_by = summary["last_date"] + pd.to_timedelta(summary["interval_days"] + cadence_slack[cadence_index], unit="D")
+    active = due_by.to_numpy() >= user_last_seen[keys // len(merchants)]
+    
+    out = pd.DataFrame({
+        "merchant": merchants[keys % len(merchants)],
+        "description": desc_uniques[summary["desc"].to_numpy()],
+        "cadence": cadence_names[cadence_index],
+        "active": active,
+        "amount": summary["last_amount"].round(2).to_numpy(),
+        "monthly_cost": (summary["last_amount"] * 30.44 / cadence_days[cadence_index]).round(2).to_numpy(),
+        "interval_days": summary["interval_days"].round(1).to_numpy(),
+        "occurrences": summary["occurrences"].astype(int).to_numpy(),
+        "first_date": summary["first_date"].dt.strftime('%Y-%m-%d').to_numpy(),
+        "last_date": summary["last_date"].dt.strftime('%Y-%m-%d').to_numpy(),
+        "next_expected": (summary["last_date"] + pd.to_timedelta(summary["interval_days"].round(), unit="D")).dt.strftime('%Y-%m-%d').to_numpy(),
+    })
+    if user_col:
+        out.insert(0, "user", users[keys // len(merchants)])
+    
+    out = out.sort_values(["active", "monthly_cost"], ascending=False, kind="mergesort")
+    return out.to_dict('records')
+
 def ingest_pdf(file_path: str) -> Dict[str, Any]:
     """Ingest PDF statement and extract transactions"""
-    global _finance_df
-    
     try:
         # Extract text from PDF
         with open(file_path, 'rb') as file:
@@ -154,7 +351,7 @@ def ingest_pdf(file_path: str) -> Dict[str, Any]:
             df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
         
         # Store normalized dataframe
-        _finance_df = df
+        _store(df, _detect_columns(df))
         
         return {
             "ok": True,
@@ -41,7 +41,8 @@ def chat(user_msg: str) -> Dict[str, Any]:
         
         return {
             "answer": answer,
-            "sources": [item["source"] for item in rag["items"]]
+            # Several passages can come from the same document
+            "sources": list(dict.fromkeys(item["source"] for item in rag["items"]))
         }
     except Exception as e:
         return {